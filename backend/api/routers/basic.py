@@ -20,10 +20,9 @@ async def chess_page() -> HTMLResponse:
 @router.post("/check_user/")
 async def check_user(form: CheckUserForm) -> JSONResponse:
     async with UserRepository() as repository:
-        user = await repository.get_one(user_id=form.user_id)
+        user, created = await repository.get_or_create(form.user_id)
 
-        if not user:
-            user = await repository.add_one(form.user_id)
+        if created:
             message = f"User {form.user_id} registered successfully"
         else:
             message = f"User {form.user_id} already registered"
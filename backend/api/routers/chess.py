@@ -1,16 +1,61 @@
+import asyncio
 import random
 
 import chess
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
 
 from backend.api.schemas.game import ChessGameForm
 from backend.api.schemas.move import MoveForm, LoadGameForm
+from backend.config.config import settings
+from backend.database.models.chess import ChessGameArchiveORM
 from backend.services.engine import GameEngine
+from backend.services.notation import (
+    export_pgn,
+    game_outcome,
+    replay_game,
+    unpack_moves,
+)
+from backend.services.ratelimit import RateLimiter
 from backend.database.repositories.chess import ChessGameRepository
+from bot.notifier import Notifier
 
 router = APIRouter()
 
 
+def _replay_record(game) -> tuple:
+    """
+    Rebuild a live or archived game and its result.
+    """
+    if isinstance(game, ChessGameArchiveORM):
+        board = replay_game(game.fen, unpack_moves(game.moves))
+        return board, game.result, game.termination
+
+    board = replay_game(game.fen, game.moves.split())
+    return board, *game_outcome(board)
+
+
+def _game_results(games: list) -> list:
+    """
+    Result and reason of each game, replaying only live ones.
+    """
+    results = []
+    for game in games:
+        if isinstance(game, ChessGameArchiveORM):
+            results.append((game.result, game.termination))
+        else:
+            results.append(game_outcome(replay_game(game.fen, game.moves.split())))
+    return results
+
+
+def _notify_game_over(game, board: chess.Board) -> None:
+    result, reason = game_outcome(board)
+    reason = reason.replace("_", " ").lower() if reason else "game over"
+    Notifier.notify(
+        game.user_id, f"Game <b>#{game.game_id}</b> ended {result} ({reason})."
+    )
+
+
 @router.post("/start_game/")
 async def start_game(data: ChessGameForm) -> dict:
     if data.mode != "bot":
@@ -19,36 +64,37 @@ async def start_game(data: ChessGameForm) -> dict:
     if not data.difficulty:
         raise HTTPException(400, detail="Difficulty required for bot mode")
 
-    player_color = (
-        data.color if data.color != "random" else random.choice(["white", "black"])
-    )
-
-    async with ChessGameRepository() as repo:
-        game = await repo.create_game(
-            user_id=data.user_id,
-            fen=chess.STARTING_FEN,
-            player_color=player_color,
-            difficulty=data.difficulty,
+    async with RateLimiter.admit("start_game", data.user_id, new_game=True):
+        player_color = (
+            data.color if data.color != "random" else random.choice(["white", "black"])
         )
 
-    board = await GameEngine.get_board(game.game_id, chess.STARTING_FEN)
-    bot_move = None
+        async with ChessGameRepository() as repo:
+            game = await repo.create_game(
+                user_id=data.user_id,
+                fen=chess.STARTING_FEN,
+                player_color=player_color,
+                difficulty=data.difficulty,
+            )
 
-    if player_color == "black":
-        bot_move = await GameEngine.play_move(game.game_id, data.difficulty)
+        board = await GameEngine.get_board(game.game_id, chess.STARTING_FEN)
+        bot_move = None
 
-        async with ChessGameRepository() as repo:
-            await repo.update_fen(game.game_id, board.fen())
+        if player_color == "black":
+            bot_move = await GameEngine.play_move(game.game_id, data.difficulty)
 
-    return {
-        "success": True,
-        "message": f"Game started vs bot ({data.difficulty})",
-        "fen": board.fen(),
-        "turn": "white" if board.turn == chess.WHITE else "black",
-        "player_color": player_color,
-        "bot_move": bot_move,
-        "game_id": game.game_id,
-    }
+            async with ChessGameRepository() as repo:
+                await repo.update_fen(game.game_id, board.fen(), [bot_move])
+
+        return {
+            "success": True,
+            "message": f"Game started vs bot ({data.difficulty})",
+            "fen": board.fen(),
+            "turn": "white" if board.turn == chess.WHITE else "black",
+            "player_color": player_color,
+            "bot_move": bot_move,
+            "game_id": game.game_id,
+        }
 
 
 @router.post("/make_move/")
@@ -58,60 +104,75 @@ async def make_move(data: MoveForm) -> dict:
         if not game or not game.is_active:
             raise HTTPException(404, detail="No active game found")
 
-    board = await GameEngine.get_board(game.game_id, game.fen)
+    new_game = not GameEngine.is_loaded(game.game_id)
+    async with RateLimiter.admit("make_move", game.user_id, new_game=new_game):
+        board = await GameEngine.get_board(game.game_id, game.fen)
 
-    move = GameEngine.parse_move(data.move, board)
-    if move not in board.legal_moves:
-        raise HTTPException(400, detail="Illegal move")
+        move = GameEngine.parse_move(data.move, board)
+        if move not in board.legal_moves:
+            raise HTTPException(400, detail="Illegal move")
 
-    board.push(move)
+        board.push(move)
 
-    if board.is_game_over(claim_draw=True):
-        async with ChessGameRepository() as repo:
-            await repo.update_fen(game.game_id, board.fen())
-            await repo.deactivate_game(game.game_id)
+        if board.is_game_over(claim_draw=True):
+            async with ChessGameRepository() as repo:
+                await repo.update_fen(game.game_id, board.fen(), [move.uci()])
+                await repo.deactivate_game(game.game_id)
 
-        await GameEngine.cleanup_game(game.game_id)
-        outcome = board.outcome()
+            await GameEngine.cleanup_game(game.game_id)
+            _notify_game_over(game, board)
+            outcome = board.outcome()
 
-        return {
-            "success": True,
-            "fen": board.fen(),
-            "game_over": True,
-            "result": board.result(),
-            "reason": outcome.termination.name if outcome else None,
-            "bot_move": None,
-        }
+            return {
+                "success": True,
+                "fen": board.fen(),
+                "game_over": True,
+                "result": board.result(),
+                "reason": outcome.termination.name if outcome else None,
+                "bot_move": None,
+            }
+
+        try:
+            bot_move = await GameEngine.play_move(game.game_id, game.difficulty)
+        except BaseException:
+            # Nothing was saved, let the player retry the same move
+            board.pop()
+            raise
 
-    bot_move = await GameEngine.play_move(game.game_id, game.difficulty)
+        if board.is_game_over(claim_draw=True):
+            async with ChessGameRepository() as repo:
+                await repo.update_fen(game.game_id, board.fen(), [move.uci(), bot_move])
+                await repo.deactivate_game(game.game_id)
+            await GameEngine.cleanup_game(game.game_id)
+            _notify_game_over(game, board)
+            outcome = board.outcome()
+            return {
+                "success": True,
+                "fen": board.fen(),
+                "bot_move": bot_move,
+                "game_over": True,
+                "result": board.result(),
+                "reason": outcome.termination.name if outcome else None,
+            }
 
-    if board.is_game_over(claim_draw=True):
         async with ChessGameRepository() as repo:
-            await repo.update_fen(game.game_id, board.fen())
-            await repo.deactivate_game(game.game_id)
-        await GameEngine.cleanup_game(game.game_id)
-        outcome = board.outcome()
+            await repo.update_fen(game.game_id, board.fen(), [move.uci(), bot_move])
+
+        if settings.BOT_TURN_NOTIFICATIONS:
+            Notifier.notify(
+                game.user_id,
+                f"Game <b>#{game.game_id}</b>: Stockfish played {bot_move}, your move.",
+            )
+
         return {
             "success": True,
             "fen": board.fen(),
             "bot_move": bot_move,
-            "game_over": True,
-            "result": board.result(),
-            "reason": outcome.termination.name if outcome else None,
+            "game_over": False,
+            "result": None,
+            "reason": None,
         }
 
-    async with ChessGameRepository() as repo:
-        await repo.update_fen(game.game_id, board.fen())
-
-    return {
-        "success": True,
-        "fen": board.fen(),
-        "bot_move": bot_move,
-        "game_over": False,
-        "result": None,
-        "reason": None,
-    }
-
 
 @router.get("/get_active_games/")
 async def get_active_games(user_id: int) -> list:
@@ -145,3 +206,52 @@ async def load_game(data: LoadGameForm) -> dict:
         "player_color": game.player_color,
         "difficulty": game.difficulty,
     }
+
+
+@router.get("/get_game_history/")
+async def get_game_history(
+    user_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> list:
+    async with ChessGameRepository() as repo:
+        games = await repo.get_finished_games(user_id, limit, offset)
+
+    results = await asyncio.to_thread(_game_results, games)
+
+    return [
+        {
+            "game_id": g.game_id,
+            "fen": g.fen,
+            "player_color": g.player_color,
+            "difficulty": g.difficulty,
+            "result": result,
+            "reason": reason,
+            "started_at": g.created_at,
+        }
+        for g, (result, reason) in zip(games, results)
+    ]
+
+
+@router.get("/export_pgn/", response_class=PlainTextResponse)
+async def export_game_pgn(game_id: str) -> PlainTextResponse:
+    async with ChessGameRepository() as repo:
+        game = await repo.get_game_record(game_id)
+
+    if not game:
+        raise HTTPException(404, detail="Game not found")
+
+    board, result, _ = await asyncio.to_thread(_replay_record, game)
+    engine = f"Stockfish ({game.difficulty})"
+
+    pgn = export_pgn(
+        board,
+        {
+            "Event": "ChessWebApp",
+            "Date": game.created_at.strftime("%Y.%m.%d"),
+            "White": "Player" if game.player_color == "white" else engine,
+            "Black": "Player" if game.player_color == "black" else engine,
+            "Result": result,
+        },
+    )
+    return PlainTextResponse(pgn)
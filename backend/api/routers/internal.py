@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from backend.services.ratelimit import RateLimiter
+
+# Served on 127.0.0.1:INTERNAL_PORT only, see backend.main
+router = APIRouter()
+
+
+@router.get("/rate_limit_stats/")
+async def rate_limit_stats() -> dict:
+    return {"rejected": dict(RateLimiter.rejections)}
@@ -10,6 +10,9 @@ class Settings(BaseSettings):
 
     BOT_TOKEN: str  # Telegram bot token
     BOT_ADMINS_ID: list[int]  # Telegram bot's admins IDs'
+    BOT_WEBHOOK_URL: str | None = None  # Public app URL, enables webhook mode
+    BOT_WEBHOOK_SECRET: str | None = None  # Secret token Telegram sends back
+    BOT_TURN_NOTIFICATIONS: bool = False  # Message users after every bot move
 
     DB_HOST: str  # PostgreSQL host
     DB_PORT: int  # PostgreSQL port
@@ -17,8 +20,32 @@ class Settings(BaseSettings):
     DB_USER: str  # Database user
     DB_PASS: str  # Database password
 
+    USER_CACHE_TTL: int = 300  # Seconds a known user is served from memory
+
     STOCKFISH_PATH: str  # Path to Stokfish binary
 
+    ENGINE_MAX_INSTANCES: int = 64  # Games held in memory before refusing new ones
+    ENGINE_MAX_SEARCHES: int = (
+        8  # Concurrent start/move requests before new ones are refused
+    )
+    ENGINE_SEARCH_TIMEOUT: float = 15  # Seconds before a search is considered hung
+    ENGINE_PING_TIMEOUT: float = 2  # Seconds an engine has to answer isready
+    ENGINE_HEALTH_INTERVAL: int = 30  # Seconds between health checks of idle engines
+    ENGINE_IDLE_TIMEOUT: int = 600  # Seconds without a move before a game is unloaded
+    ENGINE_RECYCLE_SEARCHES: int = 500  # Searches before an engine is restarted
+    ENGINE_RECYCLE_RSS_MB: int = 512  # Memory use before an engine is restarted
+
+    START_GAME_BURST: int = 3  # Games a user can start back-to-back
+    START_GAME_PER_MINUTE: float = 10  # Sustained game creation rate per user
+    MAKE_MOVE_BURST: int = 10  # Moves a user can send back-to-back
+    MAKE_MOVE_PER_MINUTE: float = 60  # Sustained move rate per user
+    RATE_LIMIT_REDIS_URL: str | None = None  # Shared limiter store, in-process if unset
+    INTERNAL_PORT: int = 8081  # Port of the stats server, bound to 127.0.0.1
+
+    ARCHIVE_AFTER_DAYS: int = 30  # Age of finished games before they are archived
+    ARCHIVE_BATCH_SIZE: int = 500  # Games moved per transaction
+    ARCHIVE_INTERVAL: int = 3600  # Seconds between archiver runs
+
     @property
     def DB_URL(self) -> str:
         return (
@@ -0,0 +1,35 @@
+-- Upgrade a database created before game IDs became globally unique.
+--
+-- Game IDs used to be unique per user only, so the same 6-digit ID can
+-- belong to several users. Every duplicate but the oldest gets a "-N"
+-- suffix, which fits the wider column and can never clash with the
+-- 10-digit IDs allocated from chess_game_id_seq.
+--
+-- Run once, before starting the new version:
+--     psql "$DATABASE" -f backend/database/migrations/001_global_game_ids.sql
+
+BEGIN;
+
+ALTER TABLE chess_games ALTER COLUMN game_id TYPE VARCHAR(10);
+ALTER TABLE chess_games
+    ADD COLUMN IF NOT EXISTS moves VARCHAR NOT NULL DEFAULT '';
+
+UPDATE chess_games AS g
+SET game_id = g.game_id || '-' || d.n
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY game_id ORDER BY id) AS n
+    FROM chess_games
+) AS d
+WHERE g.id = d.id AND d.n > 1;
+
+ALTER TABLE chess_games DROP CONSTRAINT IF EXISTS uq_user_gameid;
+ALTER TABLE chess_games
+    ADD CONSTRAINT chess_games_game_id_key UNIQUE (game_id);
+
+CREATE SEQUENCE IF NOT EXISTS chess_game_id_seq
+    START WITH 0 MINVALUE 0 MAXVALUE 9999999999;
+
+ALTER TABLE IF EXISTS chess_games_archive
+    ALTER COLUMN game_id TYPE VARCHAR(10);
+
+COMMIT;
@@ -0,0 +1,3 @@
+# Register every model on Base.metadata, so relationships resolve and
+# init_db creates all tables whichever model is imported first
+from backend.database.models import chess, user  # noqa: F401
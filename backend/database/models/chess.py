@@ -8,18 +8,28 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Integer,
+    LargeBinary,
+    Sequence,
     String,
-    UniqueConstraint,
     func,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from backend.database.models.base import Base
-
+from backend.services.game_id import GAME_ID_SPACE
 
 if TYPE_CHECKING:
     from backend.database.models.user import UserORM
 
+# Source of public game IDs, see backend.services.game_id
+game_id_seq = Sequence(
+    "chess_game_id_seq",
+    start=0,
+    minvalue=0,
+    maxvalue=GAME_ID_SPACE - 1,
+    metadata=Base.metadata,
+)
+
 
 class ChessGameORM(Base):
     """
@@ -32,9 +42,12 @@ class ChessGameORM(Base):
     user_id: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False
     )
-    game_id: Mapped[str] = mapped_column(String(6), nullable=False)
+    game_id: Mapped[str] = mapped_column(String(10), nullable=False, unique=True)
 
     fen: Mapped[str] = mapped_column(String, nullable=False)
+    moves: Mapped[str] = mapped_column(
+        String, default="", server_default="", nullable=False
+    )  # Space separated UCI moves
     player_color: Mapped[str] = mapped_column(String, nullable=False)
     difficulty: Mapped[str] = mapped_column(String, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -51,5 +64,36 @@ class ChessGameORM(Base):
 
     user: Mapped["UserORM"] = relationship("UserORM", back_populates="games")
 
-    __table_args__ = (UniqueConstraint("user_id", "game_id", name="uq_user_gameid"),)
+    repr_cols_num: int = 10
+
+
+class ChessGameArchiveORM(Base):
+    """
+    ORM for finished games moved out of chess_games by the archiver.
+    """
+
+    __tablename__ = "chess_games_archive"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False
+    )
+    game_id: Mapped[str] = mapped_column(String(10), nullable=False, unique=True)
+
+    fen: Mapped[str] = mapped_column(String, nullable=False)  # Final position
+    moves: Mapped[bytes] = mapped_column(
+        LargeBinary, nullable=False
+    )  # See backend.services.notation.pack_moves
+    player_color: Mapped[str] = mapped_column(String, nullable=False)
+    difficulty: Mapped[str] = mapped_column(String, nullable=False)
+    result: Mapped[str] = mapped_column(String(7), nullable=False)
+    termination: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    finished_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
     repr_cols_num: int = 10
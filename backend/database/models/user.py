@@ -24,12 +24,13 @@ class UserORM(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
 
-    # Relationship
+    # Relationship, only loaded on request, see UserRepository.get_one
     games: Mapped[list["ChessGameORM"]] = relationship(
         "ChessGameORM",
         back_populates="user",
         cascade="all, delete-orphan",
-        lazy="selectin",
+        passive_deletes=True,
+        lazy="raise",
     )
 
     repr_cols_num: int = 4
@@ -1,66 +1,110 @@
-import random
+import asyncio
+from datetime import datetime
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, exists, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from backend.database import engine
 from backend.database.repositories.base import BaseRepository
-from backend.database.models.chess import ChessGameORM
+from backend.database.models.chess import (
+    ChessGameArchiveORM,
+    ChessGameORM,
+    game_id_seq,
+)
+from backend.services.game_id import encode_game_id
+from backend.services.notation import game_outcome, pack_moves, replay_game
 
-from typing import Self, List
+from typing import Self, List, Tuple
+
+
+def _archive_page(
+    limit: int, offset: int, live_count: int, live_total: int
+) -> Tuple[int, int]:
+    """
+    Limit and offset of the archive part of a history page.
+
+    :param limit: Page size
+    :param offset: Page offset across live and archived games
+    :param live_count: Live games on the page
+    :param live_total: Finished live games of the user
+    :return: Limit and offset in the archive table
+    """
+    return limit - live_count, max(0, offset - live_total)
+
+
+def _archive_rows(games: List[ChessGameORM]) -> List[dict]:
+    """
+    Replay finished games into chess_games_archive rows.
+    """
+    rows = []
+    for game in games:
+        board = replay_game(game.fen, game.moves.split())
+        result, termination = game_outcome(board)
+        rows.append(
+            {
+                "user_id": game.user_id,
+                "game_id": game.game_id,
+                "fen": game.fen,
+                "moves": pack_moves([m.uci() for m in board.move_stack]),
+                "player_color": game.player_color,
+                "difficulty": game.difficulty,
+                "result": result,
+                "termination": termination,
+                "created_at": game.created_at,
+                "finished_at": game.updated_at,
+            }
+        )
+    return rows
 
 
 class ChessGameRepository(BaseRepository):
     DEFAULT_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR {} KQkq - 0 1"
+    GAME_ID_ATTEMPTS = 5
 
     def __init__(self):
         self.session: async_sessionmaker
 
     async def __aenter__(self: Self) -> Self:
-        self.session = async_sessionmaker(engine)
+        self.session = async_sessionmaker(engine, expire_on_commit=False)
         return self
 
     async def __aexit__(self, exc_type, exc_value, exc_tb) -> None:  # noqa
         return await self.session().close()
 
-    async def _generate_unique_game_id(self, session, user_id: int) -> str:
-        existing_ids = set(
-            (
-                row[0]
-                for row in (
-                    await session.execute(
-                        select(ChessGameORM.game_id).where(
-                            ChessGameORM.user_id == user_id
-                        )
-                    )
-                ).all()
-            )
-        )
-
-        while True:
-            candidate = f"{random.randint(0, 999999):06d}"
-            if candidate not in existing_ids:
-                return candidate
-
     async def create_game(
         self, user_id: int, fen: str, player_color: str, difficulty: str
     ) -> ChessGameORM:
+        """
+        Create a game under a fresh globally unique game ID.
+
+        IDs come from a sequence, so they never repeat; the insert still skips
+        conflicts and retries in case an ID was taken by a row created before
+        the sequence existed.
+        """
         async with self.session() as session:
-            game_id = await self._generate_unique_game_id(session, user_id)
-
-            new_game = ChessGameORM(
-                user_id=user_id,
-                game_id=game_id,
-                fen=fen,
-                player_color=player_color,
-                difficulty=difficulty,
-                is_active=True,
-            )
+            for _ in range(self.GAME_ID_ATTEMPTS):
+                counter = await session.scalar(select(game_id_seq.next_value()))
 
-            session.add(new_game)
-            await session.commit()
-            await session.refresh(new_game)
-            return new_game
+                new_game = await session.scalar(
+                    insert(ChessGameORM)
+                    .values(
+                        user_id=user_id,
+                        game_id=encode_game_id(counter),
+                        fen=fen,
+                        player_color=player_color,
+                        difficulty=difficulty,
+                        is_active=True,
+                    )
+                    .on_conflict_do_nothing()
+                    .returning(ChessGameORM)
+                )
+
+                if new_game is not None:
+                    await session.commit()
+                    return new_game
+
+        raise RuntimeError("Could not allocate a unique game ID")
 
     async def get_active_games(self, user_id: int) -> List[ChessGameORM]:
         async with self.session() as session:
@@ -91,12 +135,83 @@ class ChessGameRepository(BaseRepository):
             )
             return result.scalar_one_or_none()
 
-    async def update_fen(self, game_id: int, new_fen: str) -> None:
+    async def get_game_record(
+        self, game_id: str
+    ) -> ChessGameORM | ChessGameArchiveORM | None:
+        """
+        Get a game whether it is still in chess_games or already archived.
+        """
+        if game := await self.get_game(game_id):
+            return game
+
+        async with self.session() as session:
+            return await session.scalar(
+                select(ChessGameArchiveORM).where(
+                    ChessGameArchiveORM.game_id == game_id
+                )
+            )
+
+    async def get_finished_games(
+        self, user_id: int, limit: int, offset: int = 0
+    ) -> List[ChessGameORM | ChessGameArchiveORM]:
+        """
+        Get a page of a user's finished games, newest first, archived ones included.
+
+        The archiver moves the oldest games first, so the page is taken from the
+        live table and continues into the archive.
+
+        :param user_id: Telegram user ID
+        :param limit: Maximum number of games to return
+        :param offset: Number of games to skip
+        :return: List of live and archived games
+        """
+        async with self.session() as session:
+            finished = (
+                ChessGameORM.user_id == user_id,
+                ChessGameORM.is_active == False,
+            )
+
+            recent = (
+                await session.scalars(
+                    select(ChessGameORM)
+                    .where(*finished)
+                    .order_by(ChessGameORM.updated_at.desc())
+                    .limit(limit)
+                    .offset(offset)
+                )
+            ).all()
+
+            if len(recent) == limit:
+                return list(recent)
+
+            recent_total = await session.scalar(
+                select(func.count()).select_from(ChessGameORM).where(*finished)
+            )
+            archive_limit, archive_offset = _archive_page(
+                limit, offset, len(recent), recent_total
+            )
+            archived = await session.scalars(
+                select(ChessGameArchiveORM)
+                .where(ChessGameArchiveORM.user_id == user_id)
+                .order_by(ChessGameArchiveORM.finished_at.desc())
+                .limit(archive_limit)
+                .offset(archive_offset)
+            )
+
+            return [*recent, *archived.all()]
+
+    async def update_fen(
+        self, game_id: int, new_fen: str, moves: List[str] | None = None
+    ) -> None:
+        values = {"fen": new_fen}
+        if moves:
+            values["moves"] = func.ltrim(ChessGameORM.moves + " " + " ".join(moves))
+
         async with self.session() as session:
             await session.execute(
                 update(ChessGameORM)
                 .where(ChessGameORM.game_id == game_id)
-                .values(fen=new_fen)
+                .values(**values)
             )
             await session.commit()
 
@@ -108,3 +223,51 @@ class ChessGameRepository(BaseRepository):
                 .values(is_active=False)
             )
             await session.commit()
+
+    async def archive_finished_games(self, cutoff: datetime, batch_size: int) -> int:
+        """
+        Move one batch of finished games last played before cutoff into
+        chess_games_archive, in a single transaction.
+
+        :param cutoff: Only games with updated_at before it are archived
+        :param batch_size: Maximum number of games to move
+        :return: Number of games archived, 0 when nothing is left
+        """
+        async with self.session() as session:
+            games = (
+                await session.scalars(
+                    select(ChessGameORM)
+                    .where(
+                        ChessGameORM.is_active == False,
+                        ChessGameORM.updated_at < cutoff,
+                        ~exists().where(
+                            ChessGameArchiveORM.game_id == ChessGameORM.game_id
+                        ),
+                    )
+                    .order_by(ChessGameORM.id)
+                    .limit(batch_size)
+                    .with_for_update(skip_locked=True)
+                )
+            ).all()
+
+            if not games:
+                return 0
+
+            # Replaying a batch is CPU bound, keep it off the event loop
+            rows = await asyncio.to_thread(_archive_rows, games)
+
+            # A game archived concurrently is left in place rather than lost
+            archived = await session.scalars(
+                insert(ChessGameArchiveORM)
+                .values(rows)
+                .on_conflict_do_nothing(index_elements=["game_id"])
+                .returning(ChessGameArchiveORM.game_id)
+            )
+            archived_ids = archived.all()
+
+            await session.execute(
+                delete(ChessGameORM).where(ChessGameORM.game_id.in_(archived_ids))
+            )
+            await session.commit()
+
+            return len(archived_ids)
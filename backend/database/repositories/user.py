@@ -1,29 +1,60 @@
+import time
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import selectinload
 
+from backend.config.config import settings
 from backend.database import engine
 from backend.database.repositories.base import BaseRepository
 from backend.database.models.user import UserORM
 
-from typing import Self, Type
+from typing import Dict, Self, Tuple, Type
 
 
 class UserRepository(BaseRepository):
+    CACHE_SIZE = 100_000
+
+    # user_id -> (expiry, user without games)
+    _cache: Dict[int, Tuple[float, UserORM]] = {}
+
     def __init__(self):
         self.session: async_sessionmaker
 
     async def __aenter__(self: Self) -> Self:
-        self.session = async_sessionmaker(engine)
+        self.session = async_sessionmaker(engine, expire_on_commit=False)
         return self
 
     async def __aexit__(self, exc_type, exc_value, exc_tb) -> None:  # noqa
         return await self.session().close()
 
-    async def get_one(self, **kwargs) -> Type[UserORM] | None:
+    @classmethod
+    def _cache_get(cls, user_id: int) -> UserORM | None:
+        entry = cls._cache.get(user_id)
+        if not entry:
+            return None
+
+        if entry[0] < time.monotonic():
+            cls._cache.pop(user_id, None)
+            return None
+
+        return entry[1]
+
+    @classmethod
+    def _cache_put(cls, user: UserORM) -> None:
+        # Popped and re-inserted so the dict stays ordered by expiry
+        if cls._cache.pop(user.user_id, None) is None:
+            if len(cls._cache) >= cls.CACHE_SIZE:
+                cls._cache.pop(next(iter(cls._cache)))  # Soonest to expire
+
+        cls._cache[user.user_id] = (time.monotonic() + settings.USER_CACHE_TTL, user)
+
+    async def get_one(self, with_games: bool = False, **kwargs) -> Type[UserORM] | None:
         """
         Get user-entry by it's id, if it exists
+        :param with_games: Also load the user's games, bypasses the cache
         :param kwargs: id
         :return: UserORM
         """
@@ -31,11 +62,45 @@ class UserRepository(BaseRepository):
         if not user_id:
             raise ValueError("User ID not specified")
 
+        if not with_games and (user := self._cache_get(user_id)):
+            return user
+
+        query = select(UserORM).where(UserORM.user_id == user_id)
+        if with_games:
+            query = query.options(selectinload(UserORM.games))
+
         async with self.session() as session:
-            result = await session.execute(
-                select(UserORM).where(UserORM.user_id == user_id)
+            result = await session.execute(query)
+            user = result.scalar_one_or_none()
+
+        if user and not with_games:
+            self._cache_put(user)
+
+        return user
+
+    async def get_or_create(self, user_id: int) -> Tuple[UserORM, bool]:
+        """
+        Get a user, registering it first if it does not exist yet.
+        :param user_id: Telegram user ID
+        :return: UserORM and whether it was just created
+        """
+        if user := self._cache_get(user_id):
+            return user, False
+
+        async with self.session() as session:
+            user = await session.scalar(
+                insert(UserORM)
+                .values(user_id=user_id, registration_date=datetime.now(timezone.utc))
+                .on_conflict_do_nothing(index_elements=["user_id"])
+                .returning(UserORM)
             )
-            return result.scalar_one_or_none()
+            await session.commit()
+
+        if not user:
+            return await self.get_one(user_id=user_id), False
+
+        self._cache_put(user)
+        return user, True
 
     async def add_one(self, user_id: int) -> UserORM:
         """
@@ -57,7 +122,7 @@ class UserRepository(BaseRepository):
 
     async def remove_one(self, **kwargs) -> ValueError | str:
         """
-        Remove user by user_id and reindex remaining users
+        Remove user by user_id, their games are removed by the database
         :param kwargs: user_id
         :return: ValueError or str
         """
@@ -65,26 +130,15 @@ class UserRepository(BaseRepository):
         if not user_id:
             raise ValueError("User ID not specified")
 
+        self._cache.pop(user_id, None)
+
         async with self.session() as session:
-            if not (
-                user := await session.execute(
-                    select(UserORM).where(UserORM.user_id == user_id)
-                )
-            ):
-                return f"No user with user_id {user_id} found"
+            result = await session.execute(
+                delete(UserORM).where(UserORM.user_id == user_id)
+            )
+            await session.commit()
 
-            user_instance = user.scalars().first()
-            if not user_instance:
+            if not result.rowcount:
                 return f"No user with user_id {user_id} found"
 
-            await session.delete(user_instance)
-            await session.flush()
-
-            result = await session.execute(select(UserORM).order_by(UserORM.id))
-            users = result.scalars().all()
-
-            for index, u in enumerate(users):
-                u.id = index + 1
-
-            await session.commit()
             return f"User with user_id {user_id} removed"
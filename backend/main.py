@@ -1,5 +1,7 @@
 import os
 import asyncio
+import logging
+from typing import Awaitable, Callable
 
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
@@ -9,7 +11,16 @@ from uvicorn.server import Server
 
 from backend.api.routers.basic import router as misc_router
 from backend.api.routers.chess import router as chess_router
+from backend.api.routers.internal import router as internal_router
+from backend.config.config import settings
 from backend.database import init_db
+from backend.services.archiver import run_archiver
+from backend.services.engine import GameEngine
+
+# Seconds before a crashed background job is restarted
+JOB_RESTART_DELAY = 10
+
+logger = logging.getLogger(__name__)
 
 
 def init_fastapi_routers(app: FastAPI) -> None:
@@ -23,19 +34,26 @@ def init_fastapi_routers(app: FastAPI) -> None:
     app.include_router(chess_router)
 
 
-# async def start_telegram_bot() -> None:
-#     """
-#     Start the Telegram bot.
+async def run_supervised(name: str, job: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run a background job forever, logging and restarting it when it fails, so
+    that it never takes the web server down with it.
 
-#     :return: None
-#     """
-#     bot = Bot(
-#         token=settings.BOT_TOKEN,
-#         default=DefaultBotProperties(parse_mode=ParseMode.HTML),
-#     )
-#     dp = Dispatcher()
+    :param name: Job name used in logs
+    :param job: Coroutine function running the job
+    :return: None
+    """
+    while True:
+        try:
+            await job()
+            logger.warning("Background job %s exited, restarting", name)
+        except asyncio.CancelledError:
+            raise
+        except (Exception, SystemExit):
+            # uvicorn exits the process when it cannot bind, see Server.startup
+            logger.exception("Background job %s failed, restarting", name)
 
-#     await dp.start_polling(bot)
+        await asyncio.sleep(JOB_RESTART_DELAY)
 
 
 async def main() -> None:
@@ -54,8 +72,45 @@ async def main() -> None:
     )
     server = Server(config=config)
 
+    # Operational endpoints, only reachable from the host itself
+    internal_app = FastAPI(docs_url=None, redoc_url=None)
+    internal_app.include_router(internal_router)
+    internal_server = Server(
+        config=Config(
+            app=internal_app,
+            host="127.0.0.1",
+            port=settings.INTERNAL_PORT,
+            loop="asyncio",
+        )
+    )
+
     init_fastapi_routers(app)
-    await asyncio.gather(init_db(), server.serve())  # start_telegram_bot()
+    jobs = {
+        "internal_server": internal_server.serve,
+        "archiver": run_archiver,
+        "engine_supervisor": GameEngine.supervise,
+    }
+
+    if settings.BOT_WEBHOOK_URL and not settings.BOT_WEBHOOK_SECRET:
+        logger.error("BOT_WEBHOOK_SECRET is not set, Telegram webhook disabled")
+    elif settings.BOT_WEBHOOK_URL:
+        from bot.webhook import router as bot_router, start_telegram_bot
+
+        app.include_router(bot_router)
+        jobs["telegram_bot"] = start_telegram_bot
+
+    await init_db()
+
+    background = [
+        asyncio.create_task(run_supervised(name, job), name=name)
+        for name, job in jobs.items()
+    ]
+    try:
+        await server.serve()
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
 
 
 if __name__ == "__main__":
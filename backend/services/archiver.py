@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from backend.config.config import settings
+from backend.database import init_db
+from backend.database.repositories.chess import ChessGameRepository
+
+logger = logging.getLogger(__name__)
+
+
+async def archive_finished_games(older_than: timedelta, batch_size: int) -> int:
+    """
+    Move finished games older than the given age into the archive table.
+
+    :param older_than: Minimum time since a game was last played
+    :param batch_size: Games moved per transaction
+    :return: Total number of games archived
+    """
+    cutoff = datetime.now(timezone.utc) - older_than
+    total = 0
+
+    async with ChessGameRepository() as repo:
+        while moved := await repo.archive_finished_games(cutoff, batch_size):
+            total += moved
+
+    return total
+
+
+async def run_archiver() -> None:
+    """
+    Archive finished games every ARCHIVE_INTERVAL seconds, forever.
+
+    :return: None
+    """
+    while True:
+        try:
+            total = await archive_finished_games(
+                timedelta(days=settings.ARCHIVE_AFTER_DAYS), settings.ARCHIVE_BATCH_SIZE
+            )
+            if total:
+                logger.info("Archived %d finished games", total)
+        except Exception:
+            logger.exception("Archiving finished games failed")
+
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive finished chess games.")
+    parser.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    await init_db()
+    total = await archive_finished_games(timedelta(days=args.days), args.batch_size)
+    print(f"Archived {total} finished games.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,57 +1,179 @@
+import asyncio
+import logging
+import time
 from typing import Dict
 
 import chess
 from fastapi import HTTPException
-from stockfish import Stockfish
 
 from backend.config.config import settings
+from backend.services.worker import EngineError, EngineWorker
 
-DIFFICULTY_PRESETS: Dict[str, dict] = {
-    "easy": {"skill": 1, "depth": 8, "time": 0.1},
-    "medium": {"skill": 10, "depth": 12, "time": 0.3},
-    "hard": {"skill": 15, "depth": 18, "time": 0.7},
-    "impossible": {"skill": 20, "depth": None, "time": 1.0},
-}
+logger = logging.getLogger(__name__)
 
 
 class GameEngine:
-    _engines: Dict[int, Stockfish] = {}
+    SEARCH_ATTEMPTS = 2
+
+    _engines: Dict[int, EngineWorker] = {}
     _boards: Dict[int, chess.Board] = {}
+    _last_used: Dict[int, float] = {}
+    # Requests admitted by reserve() and not yet released
+    _admitted: int = 0
+    _pending_games: int = 0
+
+    @classmethod
+    def pool_saturated(cls, new_game: bool = False) -> bool:
+        """
+        Check whether the engine pool can take more work.
+
+        Every game held in memory gets an engine on its first bot move, so
+        games are counted whether or not their engine has started yet, and
+        so are admitted games that are not loaded yet.
+
+        :param new_game: Whether the caller is about to load a game that is
+            not held in memory.
+        :return: True if the request should be refused
+        """
+        if cls._admitted >= settings.ENGINE_MAX_SEARCHES:
+            return True
+
+        loaded = len(cls._boards) + cls._pending_games
+        return new_game and loaded >= settings.ENGINE_MAX_INSTANCES
+
+    @classmethod
+    def reserve(cls, new_game: bool = False) -> bool:
+        """
+        Take a slot in the pool for a request that may search, and for the
+        game it loads, before the request awaits anything.
+
+        :param new_game: Whether the request loads a game not held in memory
+        :return: False if the pool is saturated and nothing was taken
+        """
+        if cls.pool_saturated(new_game):
+            return False
+
+        cls._admitted += 1
+        cls._pending_games += new_game
+        return True
+
+    @classmethod
+    def release(cls, new_game: bool = False) -> None:
+        cls._admitted -= 1
+        cls._pending_games -= new_game
+
+    @classmethod
+    def is_loaded(cls, game_id: int) -> bool:
+        return game_id in cls._boards
 
     @classmethod
     async def get_board(cls, game_id: int, fen: str) -> chess.Board:
+        cls._last_used[game_id] = time.monotonic()
         if game_id not in cls._boards:
             cls._boards[game_id] = chess.Board(fen)
         return cls._boards[game_id]
 
     @classmethod
-    async def get_engine(cls, game_id: int, difficulty: str) -> Stockfish:
+    async def get_engine(cls, game_id: int, difficulty: str) -> EngineWorker:
         if game_id not in cls._engines:
-            preset = DIFFICULTY_PRESETS[difficulty]
-            engine = Stockfish(
-                path=settings.STOCKFISH_PATH,
-                depth=preset["depth"] or 15,
-                parameters={"Skill Level": preset["skill"]},
-            )
-            cls._engines[game_id] = engine
+            worker = await EngineWorker.spawn(difficulty)
+
+            # Another request may have started one meanwhile
+            if cls._engines.setdefault(game_id, worker) is not worker:
+                worker.kill()
+
         return cls._engines[game_id]
 
+    @classmethod
+    def _discard(cls, game_id: int, worker: EngineWorker) -> None:
+        worker.kill()
+        if cls._engines.get(game_id) is worker:
+            del cls._engines[game_id]
+
     @classmethod
     async def play_move(cls, game_id: int, difficulty: str) -> str:
         board = cls._boards[game_id]
+        cls._last_used[game_id] = time.monotonic()
 
-        engine = await cls.get_engine(game_id, difficulty)
-        engine.set_fen_position(board.fen())
+        move = await cls._search(game_id, difficulty, board.fen())
 
-        move = engine.get_best_move()
         board.push_uci(move)
 
         return move
 
+    @classmethod
+    async def _search(cls, game_id: int, difficulty: str, fen: str) -> str:
+        """
+        Search on the game's engine, retrying once on a fresh engine if it
+        crashed or hung.
+        """
+        for _ in range(cls.SEARCH_ATTEMPTS):
+            worker = None
+            try:
+                worker = await cls.get_engine(game_id, difficulty)
+                move = await worker.search(fen)
+            except EngineError:
+                logger.warning("Engine of game %s failed", game_id, exc_info=True)
+                if worker:
+                    cls._discard(game_id, worker)
+                continue
+
+            if worker.needs_recycle():
+                cls._discard(game_id, worker)
+
+            return move
+
+        raise HTTPException(503, detail="Chess engine unavailable, try again")
+
+    @classmethod
+    async def supervise(cls) -> None:
+        """
+        Every ENGINE_HEALTH_INTERVAL seconds, unload idle games and
+        health-check idle engines, replacing the ones that are dead, hung or
+        due for recycling.
+
+        :return: None
+        """
+        while True:
+            await asyncio.sleep(settings.ENGINE_HEALTH_INTERVAL)
+            await cls.evict_idle()
+
+            for game_id, worker in list(cls._engines.items()):
+                if await worker.ping() and not worker.needs_recycle():
+                    continue
+
+                logger.info("Restarting engine of game %s", game_id)
+                cls._discard(game_id, worker)
+
+                if game_id not in cls._boards:
+                    continue
+
+                try:
+                    await cls.get_engine(game_id, worker.difficulty)
+                except EngineError:
+                    logger.warning("Engine of game %s failed to restart", game_id)
+
+    @classmethod
+    async def evict_idle(cls) -> None:
+        """
+        Unload games without a move for ENGINE_IDLE_TIMEOUT seconds, their
+        board is rebuilt from the stored FEN if the player comes back.
+
+        :return: None
+        """
+        deadline = time.monotonic() - settings.ENGINE_IDLE_TIMEOUT
+
+        for game_id, last_used in list(cls._last_used.items()):
+            worker = cls._engines.get(game_id)
+            if last_used < deadline and not (worker and worker.busy):
+                await cls.cleanup_game(game_id)
+
     @classmethod
     async def cleanup_game(cls, game_id: int):
-        cls._engines.pop(game_id, None)
+        if worker := cls._engines.pop(game_id, None):
+            worker.kill()
         cls._boards.pop(game_id, None)
+        cls._last_used.pop(game_id, None)
 
     @staticmethod
     def parse_move(move_str: str, board: chess.Board) -> chess.Move:
@@ -0,0 +1,38 @@
+GAME_ID_DIGITS = 10
+GAME_ID_SPACE = 10**GAME_ID_DIGITS
+
+_HALF = 10 ** (GAME_ID_DIGITS // 2)
+_ROUND_KEYS = (0x2C1B, 0x7F4A, 0x13D9, 0x5E86)
+
+
+_MASK = (1 << 64) - 1
+
+
+def _round(value: int, key: int) -> int:
+    # splitmix64 finalizer, so neighbouring inputs give unrelated outputs
+    x = (value ^ key) * 0x9E3779B97F4A7C15 & _MASK
+    x = (x ^ x >> 30) * 0xBF58476D1CE4E5B9 & _MASK
+    x = (x ^ x >> 27) * 0x94D049BB133111EB & _MASK
+    return (x ^ x >> 31) % _HALF
+
+
+def encode_game_id(counter: int) -> str:
+    """
+    Turn a sequence value into a short public game ID.
+
+    A balanced Feistel network over the two 5-digit halves is a permutation
+    of the 10-digit space, so distinct counters always give distinct IDs,
+    while consecutive counters do not give guessable consecutive IDs. Legacy
+    IDs are 6 characters long and never clash with these.
+
+    :param counter: Sequence value, 0 <= counter < GAME_ID_SPACE
+    :return: Zero-padded game ID
+    """
+    if not 0 <= counter < GAME_ID_SPACE:
+        raise ValueError("Game ID space exhausted")
+
+    left, right = divmod(counter, _HALF)
+    for key in _ROUND_KEYS:
+        left, right = right, (left + _round(right, key)) % _HALF
+
+    return f"{left * _HALF + right:0{GAME_ID_DIGITS}d}"
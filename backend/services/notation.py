@@ -0,0 +1,86 @@
+from typing import Dict, List, Tuple
+
+import chess
+import chess.pgn
+
+# Promotion piece <-> 3-bit code, 0 means no promotion
+_PROMOTIONS = (None, None, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN)
+
+
+def pack_moves(moves: List[str]) -> bytes:
+    """
+    Pack UCI moves into 2 bytes each: from (6 bits), to (6 bits), promotion (3 bits).
+
+    :param moves: Moves in UCI notation
+    :return: Packed move log
+    """
+    packed = bytearray()
+    for uci in moves:
+        move = chess.Move.from_uci(uci)
+        code = move.from_square | move.to_square << 6
+        if move.promotion:
+            code |= _PROMOTIONS.index(move.promotion) << 12
+        packed += code.to_bytes(2, "big")
+    return bytes(packed)
+
+
+def unpack_moves(data: bytes) -> List[str]:
+    """
+    Unpack a move log produced by pack_moves.
+
+    :param data: Packed move log
+    :return: Moves in UCI notation
+    """
+    moves = []
+    for i in range(0, len(data), 2):
+        code = int.from_bytes(data[i : i + 2], "big")
+        move = chess.Move(code & 0x3F, code >> 6 & 0x3F, _PROMOTIONS[code >> 12])
+        moves.append(move.uci())
+    return moves
+
+
+def replay_game(fen: str, moves: List[str]) -> chess.Board:
+    """
+    Rebuild a game from its move log.
+
+    Games started before moves were logged have an incomplete log, in that
+    case only the final position is returned.
+
+    :param fen: Final position of the game
+    :param moves: Moves in UCI notation, from the starting position
+    :return: Board with the full move stack if the log is complete
+    """
+    final = chess.Board(fen)
+    board = chess.Board()
+
+    try:
+        for uci in moves:
+            board.push_uci(uci)
+    except ValueError:
+        return final
+
+    return board if board.board_fen() == final.board_fen() else final
+
+
+def game_outcome(board: chess.Board) -> Tuple[str, str | None]:
+    """
+    :param board: Final position of the game
+    :return: PGN result and termination reason
+    """
+    outcome = board.outcome(claim_draw=True)
+    if not outcome:
+        return "*", None
+    return outcome.result(), outcome.termination.name
+
+
+def export_pgn(board: chess.Board, headers: Dict[str, str]) -> str:
+    """
+    :param board: Board returned by replay_game
+    :param headers: Extra PGN headers
+    :return: PGN text of the game
+    """
+    game = chess.pgn.Game.from_board(board)
+    game.headers.update(headers)
+
+    exporter = chess.pgn.StringExporter(headers=True, variations=False)
+    return game.accept(exporter)
@@ -0,0 +1,167 @@
+import logging
+import math
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Tuple
+
+from fastapi import HTTPException
+
+from backend.config.config import settings
+from backend.services.engine import GameEngine
+
+logger = logging.getLogger(__name__)
+
+# scope -> (burst, tokens refilled per second)
+LIMITS: Dict[str, Tuple[int, float]] = {
+    "start_game": (settings.START_GAME_BURST, settings.START_GAME_PER_MINUTE / 60),
+    "make_move": (settings.MAKE_MOVE_BURST, settings.MAKE_MOVE_PER_MINUTE / 60),
+}
+
+# Seconds a client is asked to wait when the engine pool is saturated
+ENGINE_RETRY_AFTER = 1
+
+_TOKEN_BUCKET_LUA = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 't') or ARGV[1])
+local stamp = tonumber(redis.call('HGET', KEYS[1], 's') or ARGV[3])
+local burst, rate, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+tokens = math.min(burst, tokens + (now - stamp) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 't', tokens, 's', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class MemoryBucketStore:
+    """
+    Token buckets kept in the current process, least recently used evicted first.
+    """
+
+    MAX_BUCKETS = 100_000
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def take(self, key: str, burst: int, rate: float) -> float:
+        """
+        Take a token from the bucket.
+
+        :param key: Bucket key
+        :param burst: Bucket capacity
+        :param rate: Tokens refilled per second
+        :return: 0 if a token was taken, otherwise seconds until one is available
+        """
+        now = time.monotonic()
+
+        # Popped and re-inserted so the dict stays ordered by last use
+        if (bucket := self._buckets.pop(key, None)) is None:
+            if len(self._buckets) >= self.MAX_BUCKETS:
+                self._buckets.pop(next(iter(self._buckets)))
+            bucket = (burst, now)
+
+        tokens, stamp = bucket
+        tokens = min(burst, tokens + (now - stamp) * rate)
+
+        if tokens >= 1:
+            self._buckets[key] = (tokens - 1, now)
+            return 0
+
+        self._buckets[key] = (tokens, now)
+        return (1 - tokens) / rate
+
+
+class RedisBucketStore:
+    """
+    Token buckets shared between processes through Redis.
+    """
+
+    def __init__(self, url: str):
+        from redis.asyncio import Redis
+
+        # Fail fast, requests fall back to in-process limits meanwhile
+        self._redis = Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._script = self._redis.register_script(_TOKEN_BUCKET_LUA)
+
+    async def take(self, key: str, burst: int, rate: float) -> float:
+        wait = await self._script(
+            keys=[f"ratelimit:{key}"], args=[burst, rate, time.time()]
+        )
+        return float(wait)
+
+
+class RateLimiter:
+    _store: MemoryBucketStore | RedisBucketStore | None = None
+    # Used while the shared store is unreachable, limits are then per process
+    _fallback = MemoryBucketStore()
+    _store_failing: bool = False
+    rejections: Counter = Counter()
+
+    @classmethod
+    def get_store(cls) -> MemoryBucketStore | RedisBucketStore:
+        if cls._store is None:
+            if settings.RATE_LIMIT_REDIS_URL:
+                cls._store = RedisBucketStore(settings.RATE_LIMIT_REDIS_URL)
+            else:
+                cls._store = cls._fallback
+        return cls._store
+
+    @classmethod
+    async def _take(cls, key: str, burst: int, rate: float) -> float:
+        try:
+            wait = await cls.get_store().take(key, burst, rate)
+        except Exception:
+            if not cls._store_failing:
+                logger.exception("Rate limit store failed, limiting per process")
+            cls._store_failing = True
+            return await cls._fallback.take(key, burst, rate)
+
+        if cls._store_failing:
+            logger.info("Rate limit store recovered")
+        cls._store_failing = False
+        return wait
+
+    @classmethod
+    def _reject(cls, scope: str, reason: str, retry_after: float) -> HTTPException:
+        cls.rejections[f"{scope}:{reason}"] += 1
+        return HTTPException(
+            429,
+            detail="Too many requests, try again later",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+    @classmethod
+    @asynccontextmanager
+    async def admit(
+        cls, scope: str, user_id: int, new_game: bool = False
+    ) -> AsyncIterator[None]:
+        """
+        Admit a request for the duration of the block or refuse it with 429.
+
+        The engine pool slot is taken before anything is awaited, so a burst
+        of concurrent requests cannot all pass the check, and is given back
+        when the block exits.
+
+        :param scope: Endpoint the limit applies to, one of LIMITS
+        :param user_id: Telegram user ID the request is made for
+        :param new_game: Whether the request loads a game not held in memory
+        :return: None
+        """
+        if not GameEngine.reserve(new_game):
+            raise cls._reject(scope, "engine_pool", ENGINE_RETRY_AFTER)
+
+        try:
+            burst, rate = LIMITS[scope]
+            wait = await cls._take(f"{scope}:{user_id}", burst, rate)
+
+            if wait:
+                raise cls._reject(scope, "user_rate", wait)
+
+            yield
+        finally:
+            GameEngine.release(new_game)
@@ -0,0 +1,168 @@
+import asyncio
+from typing import Dict
+
+from stockfish import Stockfish, StockfishException
+
+from backend.config.config import settings
+
+DIFFICULTY_PRESETS: Dict[str, dict] = {
+    "easy": {"skill": 1, "depth": 8, "time": 0.1},
+    "medium": {"skill": 10, "depth": 12, "time": 0.3},
+    "hard": {"skill": 15, "depth": 18, "time": 0.7},
+    "impossible": {"skill": 20, "depth": None, "time": 1.0},
+}
+
+# What a crashed or closed engine raises from inside the stockfish package
+_ENGINE_FAILURES = (StockfishException, OSError, ValueError, IndexError)
+
+
+class EngineError(Exception):
+    """
+    Raised when a Stockfish worker crashed, hung, or could not be started.
+    """
+
+
+class EngineWorker:
+    """
+    A Stockfish process with timeouts, health checks and resource accounting.
+
+    The stockfish package blocks on the engine's stdout without a timeout, so
+    every call runs in a thread and a worker that does not answer in time is
+    killed, which unblocks that thread.
+    """
+
+    START_TIMEOUT = 10
+
+    def __init__(self, engine: Stockfish, difficulty: str):
+        self.difficulty = difficulty
+        self.searches = 0
+
+        self._engine = engine
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    async def spawn(cls, difficulty: str) -> "EngineWorker":
+        """
+        Start a Stockfish process configured for the given difficulty.
+
+        :param difficulty: Key of DIFFICULTY_PRESETS
+        :return: EngineWorker
+        """
+        preset = DIFFICULTY_PRESETS[difficulty]
+
+        # Created before __init__ runs, so a hung start can still be killed
+        engine = Stockfish.__new__(Stockfish)
+        worker = cls(engine, difficulty)
+
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(
+                    engine.__init__,
+                    path=settings.STOCKFISH_PATH,
+                    depth=preset["depth"] or 15,
+                    parameters={"Skill Level": preset["skill"]},
+                ),
+                cls.START_TIMEOUT,
+            )
+        except (asyncio.TimeoutError, *_ENGINE_FAILURES) as e:
+            worker.kill()
+            raise EngineError(f"Could not start Stockfish: {e!r}") from e
+        except BaseException:
+            # Cancelled mid-start, the thread stays blocked until the process dies
+            worker.kill()
+            raise
+
+        return worker
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    @property
+    def pid(self) -> int | None:
+        process = getattr(self._engine, "_stockfish", None)
+        return process.pid if process else None
+
+    async def search(self, fen: str) -> str:
+        """
+        Find the best move in a position.
+
+        :param fen: Position to search
+        :return: Best move in UCI notation
+        """
+        async with self._lock:
+            try:
+                move = await asyncio.wait_for(
+                    asyncio.to_thread(self._search, fen),
+                    settings.ENGINE_SEARCH_TIMEOUT,
+                )
+            except (asyncio.TimeoutError, *_ENGINE_FAILURES) as e:
+                self.kill()
+                raise EngineError(f"Search failed: {e!r}") from e
+            except BaseException:
+                self.kill()  # Left mid-search, the engine state is unknown
+                raise
+
+            self.searches += 1
+            return move
+
+    def _search(self, fen: str) -> str:
+        self._engine.set_fen_position(fen)
+
+        if not (move := self._engine.get_best_move()):
+            raise ValueError(f"No best move for {fen}")
+
+        return move
+
+    async def ping(self) -> bool:
+        """
+        Check that the engine answers isready in time, killing it otherwise.
+
+        A worker busy with a search is reported healthy, the search has
+        its own timeout.
+
+        :return: Whether the engine is alive
+        """
+        if self.busy:
+            return True
+
+        async with self._lock:
+            try:
+                await asyncio.wait_for(
+                    asyncio.to_thread(self._engine._is_ready),
+                    settings.ENGINE_PING_TIMEOUT,
+                )
+                return True
+            except (asyncio.TimeoutError, *_ENGINE_FAILURES):
+                self.kill()
+                return False
+            except BaseException:
+                self.kill()
+                raise
+
+    def rss(self) -> int:
+        """
+        :return: Resident memory of the engine process in bytes, 0 if unknown
+        """
+        try:
+            with open(f"/proc/{self.pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass
+
+        return 0
+
+    def needs_recycle(self) -> bool:
+        return (
+            self.searches >= settings.ENGINE_RECYCLE_SEARCHES
+            or self.rss() >= settings.ENGINE_RECYCLE_RSS_MB * 1024 * 1024
+        )
+
+    def kill(self) -> None:
+        process = getattr(self._engine, "_stockfish", None)
+
+        if process and process.poll() is None:
+            process.kill()
+            process.wait()
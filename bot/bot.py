@@ -5,6 +5,7 @@ import sys
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramBadRequest
 from aiogram.filters import CommandStart
 from aiogram.types import (
     Message,
@@ -18,10 +19,22 @@ from backend.config.config import settings
 
 dp = Dispatcher()
 
+WELCOME_PHOTO_PATH = "bot/assets/ChessWebAppWelcome.png"
+
+# Telegram file_id of the welcome photo, set after its first upload
+_welcome_photo_id: str | None = None
+
+
+def create_bot() -> Bot:
+    return Bot(
+        token=settings.BOT_TOKEN,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+
 
 @dp.message(CommandStart())
 async def command_start_handler(message: Message) -> None:
-    photo = FSInputFile("bot/assets/ChessWebAppWelcome.png")
+    global _welcome_photo_id
 
     caption = (
         "<b>Welcome to ChessWebApp</b> — the best Chess Bot in Telegram.\n\n"
@@ -40,15 +53,24 @@ async def command_start_handler(message: Message) -> None:
         ]
     )
 
-    await message.answer_photo(photo=photo, caption=caption, reply_markup=keyboard)
+    if _welcome_photo_id:
+        try:
+            await message.answer_photo(
+                photo=_welcome_photo_id, caption=caption, reply_markup=keyboard
+            )
+            return
+        except TelegramBadRequest:
+            # The cached file_id went stale, upload the photo again
+            _welcome_photo_id = None
+
+    sent = await message.answer_photo(
+        photo=FSInputFile(WELCOME_PHOTO_PATH), caption=caption, reply_markup=keyboard
+    )
+    _welcome_photo_id = sent.photo[-1].file_id
 
 
 async def main() -> None:
-    bot = Bot(
-        token=settings.BOT_TOKEN,
-        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
-    )
-    await dp.start_polling(bot)
+    await dp.start_polling(create_bot())
 
 
 if __name__ == "__main__":
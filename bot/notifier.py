@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from typing import Dict, List, Tuple
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Notifier:
+    """
+    Outbound message queue that stays under Telegram's rate limits.
+
+    Messages are sent in one-second rounds of at most MAX_CHATS_PER_SECOND
+    chats, each chat getting a single message per round that joins
+    everything queued for it.
+    """
+
+    MAX_CHATS_PER_SECOND = 25  # Telegram allows ~30 messages per second overall
+    MAX_PENDING = 10_000
+
+    _queue: asyncio.Queue | None = None
+    _held: Tuple[int, str] | None = None  # First message of the next round
+
+    @classmethod
+    def notify(cls, chat_id: int, text: str) -> None:
+        """
+        Queue a message, dropping it if the bot does not run in this process
+        or the queue is full.
+
+        :param chat_id: Telegram chat ID
+        :param text: HTML message text
+        :return: None
+        """
+        if cls._queue is None:
+            return
+
+        try:
+            cls._queue.put_nowait((chat_id, text))
+        except asyncio.QueueFull:
+            logger.warning("Notification queue full, dropped message to %d", chat_id)
+
+    @classmethod
+    async def run(cls, bot: Bot) -> None:
+        """
+        Send queued messages forever.
+
+        :param bot: Bot to send messages with
+        :return: None
+        """
+        # Kept across restarts so queued messages survive a crash
+        if cls._queue is None:
+            cls._queue = asyncio.Queue(maxsize=cls.MAX_PENDING)
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await cls._next_batch()
+            started = loop.time()
+
+            for chat_id, texts in batch.items():
+                await cls._send(bot, chat_id, "\n\n".join(texts))
+
+            await asyncio.sleep(max(0.0, 1 - (loop.time() - started)))
+
+    @classmethod
+    async def _next_batch(cls) -> Dict[int, List[str]]:
+        chat_id, text = cls._held or await cls._queue.get()
+        batch: Dict[int, List[str]] = {chat_id: [text]}
+        cls._held = None
+
+        while not cls._queue.empty():
+            chat_id, text = cls._queue.get_nowait()
+            if chat_id not in batch and len(batch) >= cls.MAX_CHATS_PER_SECOND:
+                cls._held = (chat_id, text)
+                break
+            batch.setdefault(chat_id, []).append(text)
+
+        return batch
+
+    @staticmethod
+    async def _send(bot: Bot, chat_id: int, text: str) -> None:
+        for _ in range(3):
+            try:
+                await bot.send_message(chat_id, text)
+                return
+            except TelegramRetryAfter as e:
+                await asyncio.sleep(e.retry_after)
+            except TelegramForbiddenError:
+                return  # The user blocked the bot
+            except TelegramAPIError:
+                logger.exception("Failed to notify %d", chat_id)
+                return
@@ -0,0 +1,79 @@
+import asyncio
+import hmac
+import logging
+
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import Update
+from fastapi import APIRouter, Header, HTTPException
+
+from backend.config.config import settings
+from bot.bot import create_bot, dp
+from bot.notifier import Notifier
+
+WEBHOOK_PATH = "/telegram/webhook/"
+# Seconds between attempts to register the webhook, doubled up to the maximum
+WEBHOOK_RETRY_DELAY = 5
+WEBHOOK_RETRY_MAX_DELAY = 300
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+bot = create_bot()
+
+
+@router.post(WEBHOOK_PATH)
+async def telegram_webhook(
+    update: dict,
+    x_telegram_bot_api_secret_token: str | None = Header(default=None),
+) -> dict:
+    secret = settings.BOT_WEBHOOK_SECRET
+    token = x_telegram_bot_api_secret_token or ""
+    if not secret or not hmac.compare_digest(token.encode(), secret.encode()):
+        raise HTTPException(403, detail="Invalid secret token")
+
+    # Telegram resends an update until it gets a 200, even if handling it fails
+    try:
+        await dp.feed_update(bot, Update.model_validate(update, context={"bot": bot}))
+    except Exception:
+        logger.exception("Handling Telegram update %s failed", update.get("update_id"))
+
+    return {"ok": True}
+
+
+async def set_webhook() -> None:
+    """
+    Register the webhook, retrying until Telegram accepts it.
+
+    :return: None
+    """
+    delay = WEBHOOK_RETRY_DELAY
+    while True:
+        try:
+            await bot.set_webhook(
+                settings.BOT_WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH,
+                secret_token=settings.BOT_WEBHOOK_SECRET,
+                allowed_updates=dp.resolve_used_update_types(),
+            )
+        except TelegramRetryAfter as e:
+            await asyncio.sleep(e.retry_after)
+        except Exception:
+            logger.exception("Setting Telegram webhook failed, retrying in %ds", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WEBHOOK_RETRY_MAX_DELAY)
+        else:
+            logger.info("Telegram webhook set to %s", settings.BOT_WEBHOOK_URL)
+            return
+
+
+async def start_telegram_bot() -> None:
+    """
+    Register the webhook and run the notification queue of the bot.
+
+    :return: None
+    """
+    try:
+        await set_webhook()
+        await Notifier.run(bot)
+    except asyncio.CancelledError:
+        await bot.session.close()
+        raise
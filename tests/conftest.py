@@ -0,0 +1,72 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Settings are read on import, give the required ones a value
+for name, value in {
+    "BOT_TOKEN": "123:test",
+    "BOT_ADMINS_ID": "[1]",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "test",
+    "DB_USER": "test",
+    "DB_PASS": "test",
+    "STOCKFISH_PATH": "stockfish",
+}.items():
+    os.environ.setdefault(name, value)
+
+from backend.config.config import settings  # noqa: E402
+from backend.services.engine import GameEngine  # noqa: E402
+
+FAKE_UCI = Path(__file__).with_name("fake_uci.py")
+
+
+class FakeEngine:
+    def __init__(self, tmp_path: Path):
+        self.control = tmp_path / "control"
+        self.pid_file = tmp_path / "pids"
+        self.control.write_text("")
+        self.pid_file.write_text("")
+
+        # stockfish passes the path to Popen as is, so it must be executable
+        self.path = tmp_path / "stockfish"
+        self.path.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_UCI}"\n')
+        self.path.chmod(0o755)
+
+    def fault(self, kind: str) -> None:
+        self.control.write_text(kind)
+
+    def pids(self) -> list[int]:
+        return [int(pid) for pid in self.pid_file.read_text().split()]
+
+    def any_running(self) -> bool:
+        return any(map(self.is_running, self.pids()))
+
+    @staticmethod
+    def is_running(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+
+@pytest.fixture
+def fake_engine(tmp_path, monkeypatch) -> FakeEngine:
+    engine = FakeEngine(tmp_path)
+
+    monkeypatch.setenv("FAKE_UCI_CONTROL", str(engine.control))
+    monkeypatch.setenv("FAKE_UCI_PIDS", str(engine.pid_file))
+    monkeypatch.setattr(settings, "STOCKFISH_PATH", str(engine.path))
+    monkeypatch.setattr(settings, "ENGINE_SEARCH_TIMEOUT", 2)
+    monkeypatch.setattr(settings, "ENGINE_PING_TIMEOUT", 1)
+
+    yield engine
+
+    for worker in GameEngine._engines.values():
+        worker.kill()
+    GameEngine._engines.clear()
+    GameEngine._boards.clear()
+    GameEngine._last_used.clear()
@@ -0,0 +1,87 @@
+"""
+Fake UCI engine that speaks just enough of Stockfish's protocol for the
+stockfish package, and crashes or hangs on demand.
+
+The fault is read from the file named by FAKE_UCI_CONTROL and fires once,
+unless prefixed with "always:":
+
+    crash_start, hang_start   before printing the banner
+    crash, hang               on "go"
+    crash_ping, hang_ping     on "isready", once the engine is started
+
+Each process appends its pid to the file named by FAKE_UCI_PIDS.
+"""
+
+import os
+import sys
+import time
+
+import chess
+
+CONTROL = os.environ["FAKE_UCI_CONTROL"]
+
+started = False
+
+
+def fault(kind: str) -> bool:
+    try:
+        with open(CONTROL) as control:
+            current = control.read().strip()
+    except OSError:
+        return False
+
+    if current == f"always:{kind}":
+        return True
+
+    if current == kind:
+        with open(CONTROL, "w") as control:
+            control.write("")
+        return True
+
+    return False
+
+
+def trigger(kind: str) -> None:
+    if fault(f"crash{kind}"):
+        os._exit(1)
+    if fault(f"hang{kind}"):
+        time.sleep(3600)
+
+
+def out(line: str) -> None:
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+
+with open(os.environ["FAKE_UCI_PIDS"], "a") as pids:
+    pids.write(f"{os.getpid()}\n")
+
+trigger("_start")
+out("Stockfish 16 by fake")
+
+board = chess.Board()
+while line := sys.stdin.readline():
+    command = line.split()
+    if not command:
+        continue
+
+    if command[0] == "uci":
+        out("id name Stockfish 16")
+        out("option name UCI_ShowWDL type check default false")
+        out("uciok")
+    elif command[0] == "isready":
+        if started:
+            trigger("_ping")
+        out("readyok")
+    elif command[0] == "position":
+        board = chess.Board(" ".join(command[2:8]))
+    elif command[0] == "d":
+        out(f"Fen: {board.fen()}")
+        out("Checkers: ")
+    elif command[0] == "go":
+        started = True
+        trigger("")
+        out("info depth 1")
+        out(f"bestmove {next(iter(board.legal_moves)).uci()}")
+    elif command[0] == "quit":
+        break
@@ -0,0 +1,225 @@
+import asyncio
+from types import SimpleNamespace
+
+import chess
+import pytest
+from fastapi import HTTPException
+
+from backend.api.routers import chess as chess_router
+from backend.api.schemas.move import MoveForm
+from backend.config.config import settings
+from backend.services.engine import GameEngine
+from backend.services.worker import EngineError, EngineWorker
+
+GAME_ID = "0000000001"
+
+
+async def start_game() -> chess.Board:
+    return await GameEngine.get_board(GAME_ID, chess.STARTING_FEN)
+
+
+class FakeGameRepository:
+    game = SimpleNamespace(
+        game_id=GAME_ID,
+        user_id=1,
+        fen=chess.STARTING_FEN,
+        difficulty="easy",
+        is_active=True,
+    )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def get_game(self, game_id: str):
+        return self.game
+
+    async def update_fen(self, game_id: str, fen: str, moves=None) -> None:
+        self.game.fen = fen
+
+
+def test_play_move(fake_engine):
+    async def run():
+        board = await start_game()
+        move = await GameEngine.play_move(GAME_ID, "easy")
+        return board, move
+
+    board, move = asyncio.run(run())
+
+    assert board.move_stack[-1].uci() == move
+    assert GameEngine._engines[GAME_ID].searches == 1
+
+
+@pytest.mark.parametrize("fault", ["crash", "hang"])
+def test_failed_search_is_retried_on_fresh_worker(fake_engine, monkeypatch, fault):
+    monkeypatch.setattr(settings, "ENGINE_SEARCH_TIMEOUT", 0.5)
+
+    async def run():
+        await start_game()
+        await GameEngine.play_move(GAME_ID, "easy")
+        first = GameEngine._engines[GAME_ID]
+
+        fake_engine.fault(fault)
+        move = await GameEngine.play_move(GAME_ID, "easy")
+        return first, move
+
+    first, move = asyncio.run(run())
+
+    assert move
+    assert GameEngine._engines[GAME_ID] is not first
+    assert not fake_engine.is_running(first.pid)
+    assert len(fake_engine.pids()) == 2
+
+
+def test_search_timeout_kills_worker(fake_engine, monkeypatch):
+    monkeypatch.setattr(settings, "ENGINE_SEARCH_TIMEOUT", 0.5)
+    fake_engine.fault("hang")
+
+    async def run():
+        worker = await EngineWorker.spawn("easy")
+        with pytest.raises(EngineError):
+            await worker.search(chess.STARTING_FEN)
+        return worker
+
+    worker = asyncio.run(run())
+
+    assert not fake_engine.is_running(worker.pid)
+
+
+@pytest.mark.parametrize("fault", ["crash_start", "hang_start"])
+def test_failed_start_kills_process(fake_engine, monkeypatch, fault):
+    monkeypatch.setattr(EngineWorker, "START_TIMEOUT", 0.5)
+    fake_engine.fault(fault)
+
+    with pytest.raises(EngineError):
+        asyncio.run(EngineWorker.spawn("easy"))
+
+    assert not fake_engine.any_running()
+
+
+def test_cancelled_start_kills_process(fake_engine):
+    fake_engine.fault("hang_start")
+
+    async def run():
+        task = asyncio.create_task(EngineWorker.spawn("easy"))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    assert not fake_engine.any_running()
+
+
+def test_unavailable_after_both_attempts_fail(fake_engine):
+    fake_engine.fault("always:crash")
+
+    async def run():
+        await start_game()
+        with pytest.raises(HTTPException) as e:
+            await GameEngine.play_move(GAME_ID, "easy")
+        return e.value
+
+    error = asyncio.run(run())
+
+    assert error.status_code == 503
+    assert GAME_ID not in GameEngine._engines
+    assert not fake_engine.any_running()
+
+
+@pytest.mark.parametrize("fault", ["crash_ping", "hang_ping"])
+def test_supervisor_replaces_unhealthy_worker(fake_engine, monkeypatch, fault):
+    monkeypatch.setattr(settings, "ENGINE_HEALTH_INTERVAL", 0.2)
+    monkeypatch.setattr(settings, "ENGINE_PING_TIMEOUT", 0.5)
+
+    async def run():
+        await start_game()
+        await GameEngine.play_move(GAME_ID, "easy")
+        first = GameEngine._engines[GAME_ID]
+
+        fake_engine.fault(fault)
+        supervisor = asyncio.create_task(GameEngine.supervise())
+        await asyncio.sleep(1.5)
+        supervisor.cancel()
+
+        current = GameEngine._engines[GAME_ID]
+        return first, current, await current.ping()
+
+    first, current, healthy = asyncio.run(run())
+
+    assert current is not first
+    assert not fake_engine.is_running(first.pid)
+    assert healthy
+
+
+def test_worker_is_recycled_after_max_searches(fake_engine, monkeypatch):
+    monkeypatch.setattr(settings, "ENGINE_RECYCLE_SEARCHES", 2)
+
+    async def run():
+        await start_game()
+        await GameEngine.play_move(GAME_ID, "easy")
+        first = GameEngine._engines[GAME_ID]
+        await GameEngine.play_move(GAME_ID, "easy")
+        return first
+
+    first = asyncio.run(run())
+
+    assert GAME_ID not in GameEngine._engines
+    assert not fake_engine.is_running(first.pid)
+
+
+def test_idle_games_are_evicted(fake_engine, monkeypatch):
+    monkeypatch.setattr(settings, "ENGINE_IDLE_TIMEOUT", 0.2)
+
+    async def run():
+        await start_game()
+        await GameEngine.play_move(GAME_ID, "easy")
+        worker = GameEngine._engines[GAME_ID]
+
+        await GameEngine.get_board("0000000002", chess.STARTING_FEN)
+        await asyncio.sleep(0.3)
+        await GameEngine.get_board("0000000002", chess.STARTING_FEN)
+
+        await GameEngine.evict_idle()
+        return worker
+
+    worker = asyncio.run(run())
+
+    assert not GameEngine.is_loaded(GAME_ID)
+    assert GameEngine.is_loaded("0000000002")
+    assert not fake_engine.is_running(worker.pid)
+
+
+def test_pool_counts_games_without_engine(fake_engine, monkeypatch):
+    monkeypatch.setattr(settings, "ENGINE_MAX_INSTANCES", 1)
+
+    asyncio.run(start_game())
+
+    assert not GameEngine._engines
+    assert GameEngine.pool_saturated(new_game=True)
+    assert not GameEngine.pool_saturated(new_game=False)
+
+
+def test_failed_bot_move_leaves_board_unchanged(fake_engine, monkeypatch):
+    monkeypatch.setattr(chess_router, "ChessGameRepository", FakeGameRepository)
+    monkeypatch.setattr(FakeGameRepository.game, "fen", chess.STARTING_FEN)
+    move = MoveForm(game_id=GAME_ID, move="e2e4")
+
+    async def run():
+        fake_engine.fault("always:crash")
+        with pytest.raises(HTTPException) as e:
+            await chess_router.make_move(move)
+        board = GameEngine._boards[GAME_ID].copy()
+
+        fake_engine.fault("")
+        return e.value, board, await chess_router.make_move(move)
+
+    error, board, retried = asyncio.run(run())
+
+    assert error.status_code == 503
+    assert board.fen() == chess.STARTING_FEN
+    assert retried["success"] and retried["bot_move"]
+    assert FakeGameRepository.game.fen == retried["fen"]
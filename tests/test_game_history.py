@@ -0,0 +1,79 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import chess
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.database.models.base import Base
+from backend.database.models.chess import ChessGameORM
+from backend.database.repositories import chess as chess_repository
+from backend.database.repositories import user as user_repository
+from backend.database.repositories.chess import ChessGameRepository, _archive_page
+from backend.database.repositories.user import UserRepository
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.mark.parametrize(
+    "limit, offset, live_count, live_total, expected",
+    [
+        (2, 2, 1, 3, (1, 0)),  # Starts in the live table, ends in the archive
+        (2, 4, 0, 3, (2, 1)),  # Past the live table
+        (5, 0, 3, 3, (2, 0)),  # Whole live table, then the archive
+    ],
+)
+def test_archive_page(limit, offset, live_count, live_total, expected):
+    assert _archive_page(limit, offset, live_count, live_total) == expected
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+def test_history_pages_through_live_and_archived_games(monkeypatch):
+    now = datetime.now(timezone.utc)
+
+    async def run():
+        engine = create_async_engine(TEST_DATABASE_URL)
+        monkeypatch.setattr(chess_repository, "engine", engine)
+        monkeypatch.setattr(user_repository, "engine", engine)
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        async with UserRepository() as repo:
+            await repo.add_one(1)
+
+        # Five finished games, the newest first, the two oldest archived
+        async with ChessGameRepository() as repo:
+            game_ids = []
+            for age in range(5):
+                game = await repo.create_game(1, chess.STARTING_FEN, "white", "easy")
+                async with repo.session() as session:
+                    await session.execute(
+                        update(ChessGameORM)
+                        .where(ChessGameORM.game_id == game.game_id)
+                        .values(is_active=False, updated_at=now - timedelta(days=age))
+                    )
+                    await session.commit()
+                game_ids.append(game.game_id)
+
+            await repo.archive_finished_games(now - timedelta(days=2.5), 10)
+
+            pages = [
+                [g.game_id for g in await repo.get_finished_games(1, 2, offset)]
+                for offset in range(0, 6, 2)
+            ]
+            straddling = await repo.get_finished_games(1, 2, 2)
+
+        await engine.dispose()
+        return game_ids, pages, straddling
+
+    game_ids, pages, straddling = asyncio.run(run())
+
+    assert pages == [game_ids[0:2], game_ids[2:4], game_ids[4:5]]
+    assert [type(g).__name__ for g in straddling] == [
+        "ChessGameORM",
+        "ChessGameArchiveORM",
+    ]
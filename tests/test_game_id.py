@@ -0,0 +1,18 @@
+import pytest
+
+from backend.services.game_id import GAME_ID_DIGITS, GAME_ID_SPACE, encode_game_id
+
+
+def test_counters_give_distinct_ids():
+    counters = [*range(50_000), *range(GAME_ID_SPACE - 50_000, GAME_ID_SPACE)]
+
+    ids = [encode_game_id(counter) for counter in counters]
+
+    assert len(set(ids)) == len(counters)
+    assert all(len(i) == GAME_ID_DIGITS and i.isdigit() for i in ids)
+
+
+@pytest.mark.parametrize("counter", [-1, GAME_ID_SPACE])
+def test_counter_outside_space_is_rejected(counter):
+    with pytest.raises(ValueError):
+        encode_game_id(counter)
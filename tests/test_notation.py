@@ -0,0 +1,33 @@
+import chess
+
+from backend.services.notation import pack_moves, replay_game, unpack_moves
+
+
+def test_pack_round_trip_with_promotions():
+    moves = [
+        "e2e4",
+        "e1g1",
+        "e5d6",
+        "a7a8q",
+        "b2a1n",
+        "h7g8r",
+        "c2c1b",
+        "h1h8",
+    ]
+
+    packed = pack_moves(moves)
+
+    assert len(packed) == 2 * len(moves)
+    assert unpack_moves(packed) == moves
+
+
+def test_archived_game_replays_from_packed_moves():
+    board = chess.Board()
+    for san in ("e4", "d5", "exd5", "c6", "dxc6", "Nf6", "cxb7", "Nbd7", "bxa8=Q"):
+        board.push_san(san)
+    moves = [m.uci() for m in board.move_stack]
+
+    replayed = replay_game(board.fen(), unpack_moves(pack_moves(moves)))
+
+    assert replayed.move_stack == board.move_stack
+    assert replayed.fen() == board.fen()
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend.config.config import settings
+from backend.services.engine import GameEngine
+from backend.services import ratelimit
+from backend.services.ratelimit import MemoryBucketStore, RateLimiter
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(RateLimiter, "_store", MemoryBucketStore())
+    monkeypatch.setattr(RateLimiter, "_fallback", MemoryBucketStore())
+    monkeypatch.setattr(RateLimiter, "_store_failing", False)
+    monkeypatch.setattr(RateLimiter, "rejections", RateLimiter.rejections.copy())
+    return RateLimiter
+
+
+class UnreachableStore:
+    async def take(self, key: str, burst: int, rate: float) -> float:
+        raise ConnectionError("Connection refused")
+
+
+async def admit(user_id: int = 1, new_game: bool = False) -> None:
+    async with RateLimiter.admit("make_move", user_id, new_game=new_game):
+        pass
+
+
+async def admit_concurrently(count: int, new_game: bool) -> list:
+    async def request(user_id: int) -> int:
+        try:
+            async with RateLimiter.admit("make_move", user_id, new_game=new_game):
+                await asyncio.sleep(0.1)
+        except HTTPException as e:
+            return e.status_code
+        return 200
+
+    return await asyncio.gather(*(request(user_id) for user_id in range(count)))
+
+
+def test_bucket_refuses_after_burst():
+    store = MemoryBucketStore()
+
+    async def run():
+        return [await store.take("user", 2, 1.0) for _ in range(3)]
+
+    first, second, third = asyncio.run(run())
+
+    assert first == second == 0
+    assert 0 < third <= 1
+
+
+def test_least_recently_used_bucket_is_evicted(monkeypatch):
+    monkeypatch.setattr(MemoryBucketStore, "MAX_BUCKETS", 2)
+    store = MemoryBucketStore()
+
+    async def run():
+        await store.take("a", 1, 0.001)
+        await store.take("b", 1, 0.001)
+        await store.take("a", 1, 0.001)
+        await store.take("c", 1, 0.001)
+
+    asyncio.run(run())
+
+    assert list(store._buckets) == ["a", "c"]
+
+
+def test_concurrent_requests_cannot_overfill_pool(limiter, monkeypatch):
+    monkeypatch.setattr(settings, "ENGINE_MAX_SEARCHES", 2)
+
+    statuses = asyncio.run(admit_concurrently(5, new_game=False))
+
+    assert sorted(statuses) == [200, 200, 429, 429, 429]
+    assert GameEngine._admitted == 0
+
+
+def test_concurrent_new_games_cannot_overfill_pool(limiter, monkeypatch):
+    monkeypatch.setattr(settings, "ENGINE_MAX_INSTANCES", 1)
+
+    statuses = asyncio.run(admit_concurrently(3, new_game=True))
+
+    assert sorted(statuses) == [200, 429, 429]
+    assert GameEngine._pending_games == 0
+
+
+def test_user_over_limit_gets_429_with_retry_after(limiter, monkeypatch):
+    monkeypatch.setitem(ratelimit.LIMITS, "make_move", (1, 0.5))
+
+    async def run():
+        await admit()
+        with pytest.raises(HTTPException) as e:
+            await admit()
+        return e.value
+
+    error = asyncio.run(run())
+
+    assert error.status_code == 429
+    assert error.headers["Retry-After"] == "2"
+    assert limiter.rejections["make_move:user_rate"] == 1
+    assert limiter.rejections["make_move:engine_pool"] == 0
+
+
+def test_saturated_pool_gets_429_with_retry_after(limiter, monkeypatch):
+    monkeypatch.setattr(settings, "ENGINE_MAX_SEARCHES", 0)
+
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(admit())
+
+    assert e.value.status_code == 429
+    assert e.value.headers["Retry-After"] == str(ratelimit.ENGINE_RETRY_AFTER)
+    assert limiter.rejections["make_move:engine_pool"] == 1
+    assert limiter.rejections["make_move:user_rate"] == 0
+
+
+def test_unreachable_store_falls_back_to_process_limits(limiter, monkeypatch):
+    monkeypatch.setattr(RateLimiter, "_store", UnreachableStore())
+    monkeypatch.setitem(ratelimit.LIMITS, "make_move", (1, 0.5))
+
+    async def run():
+        await admit()
+        with pytest.raises(HTTPException) as e:
+            await admit()
+        return e.value
+
+    error = asyncio.run(run())
+
+    assert error.status_code == 429
+    assert limiter.rejections["make_move:user_rate"] == 1
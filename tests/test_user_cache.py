@@ -0,0 +1,22 @@
+from backend.database.models.user import UserORM
+from backend.database.repositories.user import UserRepository
+
+
+def test_refreshed_user_is_not_evicted(monkeypatch):
+    monkeypatch.setattr(UserRepository, "CACHE_SIZE", 2)
+    monkeypatch.setattr(UserRepository, "_cache", {})
+
+    for user_id in (1, 2, 1, 3):
+        UserRepository._cache_put(UserORM(user_id=user_id))
+
+    assert list(UserRepository._cache) == [1, 3]
+
+
+def test_refresh_at_capacity_keeps_other_users(monkeypatch):
+    monkeypatch.setattr(UserRepository, "CACHE_SIZE", 2)
+    monkeypatch.setattr(UserRepository, "_cache", {})
+
+    for user_id in (1, 2, 2):
+        UserRepository._cache_put(UserORM(user_id=user_id))
+
+    assert list(UserRepository._cache) == [1, 2]